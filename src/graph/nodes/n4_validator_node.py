@@ -2,6 +2,7 @@ import os
 import subprocess
 import tempfile
 
+from typing import Optional
 from graph.text_to_kg_state import TextToKGState
 from graph.base import BaseNode
 from langchain_core.language_models.base import BaseLanguageModel
@@ -9,9 +10,22 @@ from langchain_core.language_models.base import BaseLanguageModel
 
 class ValidatorNode(BaseNode):
     name: str = "ValidatorNode"
-
-    def __init__(self, llm: BaseLanguageModel):
-        """Transforms the input text and schema to a JSON-LD knowledge graph."""
+    _validator_dir: str = "src/graph/validator"
+    _default_schema_file: str = "schemaorg-all-http.ttl"
+
+    def __init__(self, llm: BaseLanguageModel, schema_file: Optional[str] = None):
+        """
+        Transforms the input text and schema to a JSON-LD knowledge graph.
+
+        Args:
+            llm (BaseLanguageModel): The language model.
+            schema_file (Optional[str]): Path to the Schema.org TTL file to validate against.
+                Defaults to the TTL file next to the validator binary.
+        """
+        # The validator runs from its own directory, so a custom path is made absolute
+        self._schema_file = (
+            os.path.abspath(schema_file) if schema_file else self._default_schema_file
+        )
         super().__init__(llm)
 
     def get_node(self):
@@ -67,10 +81,10 @@ class ValidatorNode(BaseNode):
             try:
                 # Perform Check: call the Go validator CLI
                 result = subprocess.run(
-                    ["./schema-validator", "-schema-file", "schemaorg-all-http.ttl", "-use-old-parser", tmp_path],
+                    ["./schema-validator", "-schema-file", self._schema_file, "-use-old-parser", tmp_path],
                     capture_output=True,
                     text=True,
-                    cwd="src/graph/validator",
+                    cwd=self._validator_dir,
                     timeout=30,
                 )
             finally:
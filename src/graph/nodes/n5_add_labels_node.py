@@ -1,5 +1,4 @@
 import json
-import pandas as pd
 
 from itertools import chain
 
@@ -11,6 +10,7 @@ from graph.prompts import (
     ADD_LABELS_SYSTEM_PROMPT,
 )
 from graph.utils.models import AddLabelsStructuredOutput
+from graph.utils.taxonomy import load_taxonomy
 
 from langchain_core.messages import SystemMessage, HumanMessage
 from langchain_core.language_models.base import BaseLanguageModel
@@ -20,17 +20,53 @@ class AddLabelsNode(BaseNode):
     name: str = "AddLabelsNode"
     _topics_path: str = "src/data/Hoofdklantsignalen - Subklantsignalen.xlsx"
 
+    # Define onderwerp and beleving categories
+    ONDERWERP_SIGNALS = [
+        "Bouwen en verbouwen",
+        "Burgerzaken",
+        "Dagelijks leven en sociale gelegenheden",
+        "Financiële ondersteuning",
+        "Maatschappelijke ondersteuning",
+        "No topic found",
+        "Opruimen, afval en onderhoud",
+        "Parkeren",
+        "Veiligheid en omgeving",
+        "Vervoer",
+        "Werk",
+        "Wonenen en ondernemen",
+        "Zorg",
+    ]
+
+    BELEVING_SIGNALS = [
+        "Informatievoorziening",
+        "Houding & Gedrag medewerker",
+        "Fysieke dienstverlening",
+        "Digitale mogelijkheden",
+        "Contact leggen met medewerker",
+        "Algemene ervaring",
+        "Afhandeling",
+        "Processen",
+        "Prijs & Kwaliteit",
+        "No topic found",
+        "Kennis & Vaardigheden medewerker",
+    ]
+
     def __init__(self, llm: BaseLanguageModel):
         """Adds labels to the JSON-LD knowledge graph."""
         self._topics_dict = self._get_topics_dict()
+        self._onderwerp_labels, self._beleving_labels = self._split_topics(
+            self._topics_dict
+        )
+        self._onderwerp_label_set = frozenset(self._onderwerp_labels)
+        self._beleving_label_set = frozenset(self._beleving_labels)
 
         super().__init__(llm)
 
     def _get_topics_dict(self):
         """Returns a dictionary of topics from Excel file."""
         try:
-            # Read Excel file
-            df = pd.read_excel(self._topics_path)
+            # Read Excel file (cached per process, shared with other taxonomy users)
+            df = load_taxonomy(self._topics_path)
             
             # Group subtopics by main topic
             topics_dict = df.groupby('Hoofd_klantsignaal')['Sub_klantsignaal'].apply(list).to_dict()
@@ -43,6 +79,26 @@ class AddLabelsNode(BaseNode):
             print(f"\033[91mError reading topics file: {e}\033[0m")
             return {}
 
+    def _split_topics(self, topics_dict: dict) -> tuple[list, list]:
+        """Splits the sub topics into onderwerp and beleving labels, once per node."""
+        # Separate topics by category
+        onderwerp_labels = []
+        beleving_labels = []
+
+        for hoofd_signal, sub_signals in topics_dict.items():
+            if hoofd_signal in self.ONDERWERP_SIGNALS:
+                onderwerp_labels.extend(sub_signals)
+            elif hoofd_signal in self.BELEVING_SIGNALS:
+                beleving_labels.extend(sub_signals)
+
+        # Add "No subtopic found" if not already present
+        if "No subtopic found" not in onderwerp_labels:
+            onderwerp_labels.append("No subtopic found")
+        if "No subtopic found" not in beleving_labels:
+            beleving_labels.append("No subtopic found")
+
+        return onderwerp_labels, beleving_labels
+
     def get_node(self):
         """..."""
 
@@ -132,57 +188,10 @@ class AddLabelsNode(BaseNode):
             # Then bind structured model to the (possibly wrapped) llm
             llm = llm_to_use.with_structured_output(AddLabelsStructuredOutput)
 
-            # Define onderwerp and beleving categories
-            ONDERWERP_SIGNALS = [
-                "Bouwen en verbouwen",
-                "Burgerzaken",
-                "Dagelijks leven en sociale gelegenheden",
-                "Financiële ondersteuning",
-                "Maatschappelijke ondersteuning",
-                "No topic found",
-                "Opruimen, afval en onderhoud",
-                "Parkeren",
-                "Veiligheid en omgeving",
-                "Vervoer",
-                "Werk",
-                "Wonenen en ondernemen",
-                "Zorg",
-            ]
-            
-            BELEVING_SIGNALS = [
-                "Informatievoorziening",
-                "Houding & Gedrag medewerker",
-                "Fysieke dienstverlening",
-                "Digitale mogelijkheden",
-                "Contact leggen met medewerker",
-                "Algemene ervaring",
-                "Afhandeling",
-                "Processen",
-                "Prijs & Kwaliteit",
-                "No topic found",
-                "Kennis & Vaardigheden medewerker",
-            ]
-
-            # Separate topics by category
-            onderwerp_labels = []
-            beleving_labels = []
-            
-            for hoofd_signal, sub_signals in self._topics_dict.items():
-                if hoofd_signal in ONDERWERP_SIGNALS:
-                    onderwerp_labels.extend(sub_signals)
-                elif hoofd_signal in BELEVING_SIGNALS:
-                    beleving_labels.extend(sub_signals)
-            
-            # Add "No subtopic found" if not already present
-            if "No subtopic found" not in onderwerp_labels:
-                onderwerp_labels.append("No subtopic found")
-            if "No subtopic found" not in beleving_labels:
-                beleving_labels.append("No subtopic found")
-
             # Format the human prompt
             human_prompt = ADD_LABELS_HUMAN_PROMPT.format(
-                ONDERWERP_LIST="\n".join(onderwerp_labels),
-                BELEVING_LIST="\n".join(beleving_labels),
+                ONDERWERP_LIST="\n".join(self._onderwerp_labels),
+                BELEVING_LIST="\n".join(self._beleving_labels),
                 INPUT_TEXT=state.text,
             )
 
@@ -198,9 +207,9 @@ class AddLabelsNode(BaseNode):
             onderwerp_response = response.onderwerp_labels
             beleving_response = response.beleving_labels
 
-            # Create combined topics list for validation
-            all_valid_onderwerp = onderwerp_labels
-            all_valid_beleving = beleving_labels
+            # Create combined topics sets for O(1) validation lookups
+            all_valid_onderwerp = self._onderwerp_label_set
+            all_valid_beleving = self._beleving_label_set
             
             # Validate onderwerp labels
             validated_onderwerp = [
@@ -25,8 +25,14 @@ class TextToKGPipeline:
 
     _llms: Dict[str, BaseChatModel]
     _add_labels: bool
+    _schema_file: Optional[str]
 
-    def __init__(self, llm: Union[BaseChatModel, Dict[str, BaseChatModel]], add_labels: bool = False):
+    def __init__(
+        self,
+        llm: Union[BaseChatModel, Dict[str, BaseChatModel]],
+        add_labels: bool = False,
+        schema_file: Optional[str] = None,
+    ):
         """
         Initialize the pipeline with either a single LLM or node-specific LLMs.
         
@@ -34,6 +40,8 @@ class TextToKGPipeline:
             llm: Either a single BaseChatModel to use for all nodes, or a dict mapping
                 node names to specific models. Valid node names: 'n1', 'n2', 'n3', 'n5'
             add_labels: Whether to include the label addition node
+            schema_file: Path to the Schema.org TTL file used by the validator.
+                Defaults to the TTL file shipped with the validator
         """
         if not llm:
             raise ValueError("Language model is required")
@@ -59,6 +67,7 @@ class TextToKGPipeline:
             self._llms = llm
         
         self._add_labels = add_labels
+        self._schema_file = schema_file
 
     @property
     def name(self) -> str:
@@ -123,7 +132,7 @@ class TextToKGPipeline:
         workflow.add_node(transform_to_kg_node.name, transform_to_kg_node.get_node())
 
         # Validator uses same LLM as n3 (not configurable separately)
-        validator_node = ValidatorNode(llm=self._llms['n3'])
+        validator_node = ValidatorNode(llm=self._llms['n3'], schema_file=self._schema_file)
         workflow.add_node(validator_node.name, validator_node.get_node())
 
         # Define workflow graph edges
@@ -1,9 +1,11 @@
 from .llm import azure_llm
 from .models import OwlSchema
 from .models import PropertyGraphSchema
+from .taxonomy import load_taxonomy
 
 __all__ = [
     "azure_llm",
     "OwlSchema",
     "PropertyGraphSchema",
+    "load_taxonomy",
 ]
\ No newline at end of file
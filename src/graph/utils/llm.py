@@ -1,4 +1,6 @@
 import os
+
+from functools import cache
 from langchain_openai import AzureChatOpenAI, AzureOpenAIEmbeddings
 
 
@@ -31,6 +33,13 @@ def azure_llm(model_prefix: str = None, **kwargs):
     """
     Create an instance of AzureChatOpenAI for language model (LLM) tasks.
 
+    Instances are shared per process for the same arguments, so repeated calls
+    reuse the client and its HTTP connection pool. A shared instance is used by
+    every caller (and pipeline node) that asked for the same arguments, so it
+    must not be mutated; pass different arguments, or use `.bind()` /
+    `.with_config()`, to get a differently configured model. Calls with
+    unhashable keyword arguments (e.g. callback lists) always get a new instance.
+
     Args:
         model_prefix (str, optional): The prefix to be added to the environment variable names. Defaults to None.
         **kwargs: Additional keyword arguments to be passed to AzureChatOpenAI.
@@ -38,15 +47,33 @@ def azure_llm(model_prefix: str = None, **kwargs):
     Returns:
         AzureChatOpenAI: An instance of AzureChatOpenAI for LLM tasks.
     """
+    # Resolve the environment defaults first, so equivalent calls share one instance
+    # and later changes to the environment are picked up
+    model_prefix = _resolve_model_prefix(model_prefix)
+    kwargs.setdefault("verbose", os.environ.get("VERBOSE", "0") == "1")
+
+    kwargs_key = tuple(sorted(kwargs.items()))
+    try:
+        hash(kwargs_key)
+    except TypeError:
+        return _build_azure_llm(model_prefix, **kwargs)
+
+    return _cached_azure_llm(model_prefix, kwargs_key)
+
+@cache
+def _cached_azure_llm(model_prefix: str, kwargs_key: tuple):
+    """Builds the AzureChatOpenAI instance for azure_llm once per argument set."""
+    return _build_azure_llm(model_prefix, **dict(kwargs_key))
+
+def _resolve_model_prefix(model_prefix: str = None) -> str:
+    """Returns the upper-cased model prefix, or DEFAULT_MODEL_PREFIX when none is given."""
     if model_prefix:
-        model_prefix = model_prefix.upper()
-    else:
-        model_prefix = os.getenv("DEFAULT_MODEL_PREFIX", "GPT4")
+        return model_prefix.upper()
+    return os.getenv("DEFAULT_MODEL_PREFIX", "GPT4")
 
-    if "verbose" in kwargs:
-        verbose = kwargs.pop("verbose")
-    else:
-        verbose = os.environ.get("VERBOSE", "0") == "1"
+def _build_azure_llm(model_prefix: str, **kwargs):
+    """Builds a new AzureChatOpenAI instance from the resolved arguments of azure_llm."""
+    verbose = kwargs.pop("verbose")
 
     # o1 and o3 models require specific API version
     api_version = _llm_env_var("AZURE_OPENAI_API_VERSION", model_prefix)
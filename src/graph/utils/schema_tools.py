@@ -1,18 +1,43 @@
 import yaml
+import orjson
 import sqlite3
 import re
 
+from typing import Literal
 
-def shorten_schema_yaml(yaml_content: str) -> str:
+# Prefer the libyaml-backed dumper when PyYAML was built against it
+_Dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
+# YAML 1.1 loads labels such as `yes` as booleans, so keys aren't always strings
+_JSON_OPTIONS = orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS
+_OUTPUT_FORMATS = ('yaml', 'json')
+
+
+def _check_output_format(output_format: str) -> None:
+    if output_format not in _OUTPUT_FORMATS:
+        raise ValueError(f"output_format must be one of {_OUTPUT_FORMATS}, got {output_format!r}")
+
+
+def shorten_schema_yaml(
+    yaml_content: str, output_format: Literal['yaml', 'json'] = 'yaml'
+) -> str:
     """
     Shorten Schema.org YAML by removing redundant URIs and restructuring.
     
     Args:
         yaml_content: Original YAML with full URI definitions
+        output_format: Serialize the result as 'yaml' (human readable) or
+            'json' (much faster to emit and to re-parse downstream)
         
     Returns:
-        Shortened YAML with URIs removed and more compact structure
+        Shortened YAML (or JSON) with URIs removed and more compact structure
+
+    Raises:
+        ValueError: If output_format is not 'yaml' or 'json'.
+        Exception: In JSON mode, any error while shortening; the original YAML
+            is only returned as a fallback in YAML mode.
     """
+    _check_output_format(output_format)
     try:
         data = yaml.safe_load(yaml_content)
         
@@ -45,24 +70,50 @@ def shorten_schema_yaml(yaml_content: str) -> str:
             if props:
                 shortened['properties'] = props
         
+        if output_format == 'json':
+            return orjson.dumps(shortened, option=_JSON_OPTIONS).decode()
+
         # Return shortened YAML
-        return yaml.dump(shortened, sort_keys=False, allow_unicode=True, default_flow_style=False)
+        # `shortened` is already built in the desired key order; the huge width
+        # disables line wrapping so long comments are emitted in a single pass
+        return yaml.dump(
+            shortened,
+            Dumper=_Dumper,
+            sort_keys=False,
+            allow_unicode=True,
+            default_flow_style=False,
+            width=2**31 - 1,
+            indent=2,
+        )
         
     except Exception as e:
         print(f"Error shortening YAML: {e}")
+        if output_format == 'json':
+            # The original YAML is not valid JSON, so there is no safe fallback
+            raise
         return yaml_content  # Return original if error
 
 
-def ultra_shorten_schema_yaml(yaml_content: str) -> str:
+def ultra_shorten_schema_yaml(
+    yaml_content: str, output_format: Literal['yaml', 'json'] = 'yaml'
+) -> str:
     """
     Ultra-compact Schema.org YAML by aggressive optimization.
     
     Args:
         yaml_content: Original YAML with full definitions
+        output_format: Serialize the result as 'yaml' (human readable) or
+            'json' (much faster to emit and to re-parse downstream)
         
     Returns:
-        Ultra-shortened YAML with maximum compression
+        Ultra-shortened YAML (or JSON) with maximum compression
+
+    Raises:
+        ValueError: If output_format is not 'yaml' or 'json'.
+        Exception: In JSON mode, any error while shortening; the original YAML
+            is only returned as a fallback in YAML mode.
     """
+    _check_output_format(output_format)
     try:
         data = yaml.safe_load(yaml_content)
         
@@ -157,11 +208,17 @@ def ultra_shorten_schema_yaml(yaml_content: str) -> str:
             if props_section:
                 shortened['properties'] = props_section
         
+        if output_format == 'json':
+            return orjson.dumps(shortened, option=_JSON_OPTIONS).decode()
+
         # Custom YAML formatting for maximum compactness
         return format_compact_yaml(shortened)
         
     except Exception as e:
         print(f"Error ultra-shortening YAML: {e}")
+        if output_format == 'json':
+            # The original YAML is not valid JSON, so there is no safe fallback
+            raise
         return yaml_content
 
 
@@ -0,0 +1,95 @@
+import hashlib
+import orjson
+import os
+import tempfile
+import threading
+import pandas as pd
+
+from functools import cache
+
+try:
+    # Optional: the Parquet cache needs pyarrow; without it the xlsx is parsed every run
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
+
+TAXONOMY_FILE = "src/data/Hoofdklantsignalen - Subklantsignalen.xlsx"
+
+# Parquet files live in the user's cache directory, not next to the xlsx in the source tree
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "wim-signaalberichten"
+)
+# Schema metadata key holding the size and mtime of the xlsx the cache was built from
+_SOURCE_KEY = b"taxonomy_source"
+
+# Pipelines are built in worker threads, so a cold cache can be hit concurrently
+_LOAD_LOCK = threading.Lock()
+
+
+def load_taxonomy(path: str = TAXONOMY_FILE) -> pd.DataFrame:
+    """
+    Load the klantsignalen taxonomy, parsing the Excel file at most once per process.
+
+    The parsed sheet is cached as Parquet in CACHE_DIR, which reads much faster
+    than xlsx. The cache is used only while the Excel file has the same size and
+    mtime it was built from, and ignored when it can't be read or pyarrow is
+    not installed.
+
+    Args:
+        path (str, optional): Path to the taxonomy Excel file. Defaults to TAXONOMY_FILE.
+
+    Returns:
+        pd.DataFrame: A copy of the taxonomy with 'Hoofd_klantsignaal' and 'Sub_klantsignaal' columns.
+
+    Raises:
+        FileNotFoundError: If the Excel file does not exist.
+    """
+    with _LOAD_LOCK:
+        df = _load_taxonomy(os.path.abspath(path))
+    # Callers get their own copy, so they can't change the cached DataFrame
+    return df.copy()
+
+
+@cache
+def _load_taxonomy(path: str) -> pd.DataFrame:
+    stat = os.stat(path)
+    source = orjson.dumps({"size": stat.st_size, "mtime_ns": stat.st_mtime_ns})
+    if pq is None:
+        return pd.read_excel(path)
+
+    parquet_path = os.path.join(
+        CACHE_DIR, f"taxonomy-{hashlib.sha1(path.encode()).hexdigest()[:16]}.parquet"
+    )
+    try:
+        metadata = pq.read_schema(parquet_path).metadata or {}
+        if metadata.get(_SOURCE_KEY) == source:
+            return pq.read_table(parquet_path).to_pandas()
+    except Exception:
+        # Missing or unreadable cache; fall back to the xlsx and rewrite it below
+        pass
+
+    df = pd.read_excel(path)
+    _write_parquet_cache(df, parquet_path, source)
+    return df
+
+
+def _write_parquet_cache(df: pd.DataFrame, parquet_path: str, source: bytes) -> None:
+    """Writes the Parquet cache atomically, so an interrupted write never leaves a truncated file."""
+    tmp_path = None
+    try:
+        os.makedirs(os.path.dirname(parquet_path), exist_ok=True)
+        table = pa.Table.from_pandas(df, preserve_index=False)
+        table = table.replace_schema_metadata({**(table.schema.metadata or {}), _SOURCE_KEY: source})
+        fd, tmp_path = tempfile.mkstemp(suffix=".parquet.tmp", dir=os.path.dirname(parquet_path))
+        os.close(fd)
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, parquet_path)
+    except Exception:
+        # The cache is an optimization only; without write access or
+        # Arrow-compatible columns we re-read the xlsx next time
+        if tmp_path is not None:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
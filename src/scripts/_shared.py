@@ -0,0 +1,90 @@
+"""Helpers shared by the scripts in this directory"""
+
+import argparse
+import asyncio
+
+from contextlib import asynccontextmanager
+from graph.text_to_kg_pipeline import TextToKGPipeline
+from graph.utils import azure_llm
+
+try:
+    # Optional: a faster event loop (not available on Windows)
+    import uvloop
+except ImportError:
+    uvloop = None
+
+# Compiled pipelines per (model_prefix, add_labels, schema_file), built once per process
+_PIPELINE_CACHE = {}
+
+
+def get_pipeline(model_prefix: str = "GPT4O", add_labels: bool = True, schema_file: str = None):
+    """
+    Returns the compiled pipeline for the given model, label setting and
+    validator TTL file, building and compiling it on first use only.
+
+    The validator reads the TTL schema file on every run, not when the
+    pipeline is built, so a cached pipeline picks up changes to that file.
+    """
+    key = (model_prefix, add_labels, schema_file)
+    if key not in _PIPELINE_CACHE:
+        _PIPELINE_CACHE[key] = TextToKGPipeline(
+            llm=azure_llm(model_prefix=model_prefix),
+            add_labels=add_labels,
+            schema_file=schema_file
+        ).compile()
+    return _PIPELINE_CACHE[key]
+
+
+async def prewarm_llm(llm) -> None:
+    """
+    Opens a connection to the Azure OpenAI endpoint before the first LLM call,
+    so DNS, TCP and TLS setup happen while other startup work runs. The
+    request goes through the same async client (and connection pool) the
+    model uses. Failures are ignored; the first real call reports them.
+    """
+    client = getattr(llm, "root_async_client", None)
+    if client is None:
+        return
+    try:
+        await client.models.list()
+    except Exception:
+        pass
+
+
+@asynccontextmanager
+async def warm_pipeline(model_prefix: str = "GPT4O", add_labels: bool = True, schema_file: str = None):
+    """
+    Yields the cached compiled pipeline (see get_pipeline) with a warm
+    connection to Azure. The pipeline is built in a thread while the
+    connection is opened, so both startup costs overlap.
+
+    The TTL schema is parsed by the validator binary on every run, so there
+    is nothing to preload for it here.
+    """
+    warmup = asyncio.create_task(prewarm_llm(azure_llm(model_prefix=model_prefix)))
+    try:
+        pipeline = await asyncio.to_thread(get_pipeline, model_prefix, add_labels, schema_file)
+    except BaseException:
+        # Don't leave the warmup pending; only the build error is reported
+        warmup.cancel()
+        raise
+    await warmup
+    yield pipeline
+
+
+def positive_int(value: str) -> int:
+    """argparse type for counts that must be at least 1."""
+    try:
+        number = int(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid int value: {value!r}")
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be a positive integer, got {number}")
+    return number
+
+
+def run_async(main):
+    """Runs the coroutine to completion, on uvloop's event loop when it is installed."""
+    if uvloop is None:
+        return asyncio.run(main)
+    return asyncio.run(main, loop_factory=uvloop.new_event_loop)
@@ -1,16 +1,21 @@
 import argparse
 import ast
-import json
 import os
 import sqlite3
 import sys
 
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+
 import numpy as np
+import orjson
 import pandas as pd
 
 from datasets import load_dataset, Dataset
-from graph.utils import azure_llm
+from tqdm import tqdm
+from graph.utils import azure_llm, load_taxonomy
 from graph import TextToKGPipeline, TextToKGState
+from _shared import positive_int
 
 # ANSI color codes
 class Colors:
@@ -27,7 +32,9 @@ class Colors:
     UNDERLINE = '\033[4m'
 
 TAXONOMY_FILE = "src/data/Hoofdklantsignalen - Subklantsignalen.xlsx"
-DATA = pd.read_excel(TAXONOMY_FILE)
+COMMIT_BATCH_SIZE = 50  # Number of dataset rows written per SQLite transaction
+PARALLEL_PARSE_MIN_ROWS = 10_000  # Below this, worker start-up outweighs parsing the labels
+DATA = load_taxonomy(TAXONOMY_FILE)
 ONDERWERP_SIGNALS = [
     "Bouwen en verbouwen",
     "Burgerzaken",
@@ -57,112 +64,178 @@ BELEVING_SIGNALS = [
     "Kennis & Vaardigheden medewerker",
 ]
 
+# Signal type per main signal; onderwerp wins for names in both lists ("No topic found")
+CATEGORY_BUCKET = {name: "beleving" for name in BELEVING_SIGNALS} | {
+    name: "onderwerp" for name in ONDERWERP_SIGNALS
+}
+
+# Sub-signals per signal type, computed once instead of filtering DATA per call
+ONDERWERP_SUB_LIST = DATA.loc[
+    DATA["Hoofd_klantsignaal"].isin(ONDERWERP_SIGNALS), "Sub_klantsignaal"
+].tolist()
+BELEVING_SUB_LIST = DATA.loc[
+    DATA["Hoofd_klantsignaal"].isin(BELEVING_SIGNALS), "Sub_klantsignaal"
+].tolist()
+ONDERWERP_SUB_SET = frozenset(ONDERWERP_SUB_LIST)
+BELEVING_SUB_SET = frozenset(BELEVING_SUB_LIST)
+SUB_SIGNAL_SETS = {
+    "onderwerp": ONDERWERP_SUB_SET,
+    "beleving": BELEVING_SUB_SET,
+}
+
+# The same sub-signals in taxonomy order, onderwerp first; iterate these (not the
+# frozensets, whose order changes per process) wherever row order matters
+SUB_SIGNAL_LISTS = {
+    "onderwerp": list(dict.fromkeys(ONDERWERP_SUB_LIST)),
+    "beleving": list(dict.fromkeys(BELEVING_SUB_LIST)),
+}
+
+# Signal type per sub-signal; onderwerp wins for labels in both taxonomies
+LABEL_TO_BUCKET = {label: "beleving" for label in BELEVING_SUB_LIST} | {
+    label: "onderwerp" for label in ONDERWERP_SUB_LIST
+}
+
+# Labels skipped because they are not in the taxonomy, reported once at the end of a run
+SKIPPED_LABELS = Counter()
+
+# Kept as a constant so the statement text is parsed once and then served from
+# the connection's statement cache
+UPSERT_SCORES_SQL = """
+INSERT INTO scores (signal_type, label, tp, fp, fn, tn)
+VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT(signal_type, label) DO UPDATE SET
+    tp = tp + excluded.tp,
+    fp = fp + excluded.fp,
+    fn = fn + excluded.fn,
+    tn = tn + excluded.tn
+"""
+
+INSERT_TEXT_SQL = (
+    "INSERT INTO texts_and_labels (text, gold_labels, generated_labels) VALUES (?, ?, ?)"
+)
+
 
 def get_labels_from_json_ld(state: TextToKGState) -> tuple[list, list]:
     """
     Extracts labels from the JSON-LD content in the state.
     """
-    beleving, onderwerp = [], []
-    json_ld = json.loads(state["json_ld_contents"][-1])
-
-    if "about" in json_ld:
-        for item in json_ld["about"]:
-            if item["inDefinedTermSet"]["name"] in ONDERWERP_SIGNALS:
-                onderwerp.append(item["name"])
-            elif item["inDefinedTermSet"]["name"] in BELEVING_SIGNALS:
-                beleving.append(item["name"])
-            else:
+    labels = {"beleving": [], "onderwerp": []}
+    # Parse the JSON-LD once per row with the (much faster) orjson decoder
+    json_ld = orjson.loads(state["json_ld_contents"][-1])
+    about = json_ld.get("about")
+
+    if about is not None:
+        for item in about:
+            name = item["name"]
+            category = item["inDefinedTermSet"]["name"]
+            bucket = CATEGORY_BUCKET.get(category)
+            if bucket is None:
                 # We don't raise an error, because we want to simply exclude labels that are incorrect, not stop the whole row
-                print(
-                    f"{Colors.BLINK}{Colors.ORANGE}Info: Skipping label '{item["name"]}' - category '{item["inDefinedTermSet"]["name"]}' not found in taxonomy file ({os.path.basename(TAXONOMY_FILE)}){Colors.ENDC}"
-                )
+                SKIPPED_LABELS[f"'{name}' (category '{category}')"] += 1
+            else:
+                labels[bucket].append(name)
     else:
         raise ValueError("No 'about' key found in JSON-LD content.")
-    return beleving, onderwerp
+    return labels["beleving"], labels["onderwerp"]
 
 
 def get_labels_from_validated_list(validated_labels: list) -> tuple[list, list]:
     """
     Extracts labels from the validated labels list.
     """
-    onderwerp_signals = DATA[DATA["Hoofd_klantsignaal"].isin(ONDERWERP_SIGNALS)][
-        "Sub_klantsignaal"
-    ].tolist()
-    beleving_signals = DATA[DATA["Hoofd_klantsignaal"].isin(BELEVING_SIGNALS)][
-        "Sub_klantsignaal"
-    ].tolist()
-
-    beleving, onderwerp = [], []
-    for label in validated_labels:
-        if label in onderwerp_signals:
-            onderwerp.append(label)
-        elif label in beleving_signals:
-            beleving.append(label)
+    labels = {"beleving": [], "onderwerp": []}
+    # Duplicates are dropped, keeping the first occurrence
+    for label in dict.fromkeys(validated_labels):
+        bucket = LABEL_TO_BUCKET.get(label)
+        if bucket is None:
+            SKIPPED_LABELS[f"'{label}'"] += 1
         else:
-            print(
-                f"{Colors.BLINK}{Colors.ORANGE}Info: Skipping label '{label}' - not found in taxonomy file ({os.path.basename(TAXONOMY_FILE)}){Colors.ENDC}"
-            )
-    return beleving, onderwerp
+            labels[bucket].append(label)
+    return labels["beleving"], labels["onderwerp"]
 
 
 def calculate_metrics_signals(
     signal_type: str,
     generated: list,
     actual: list,
-    cursor: sqlite3.Cursor,
+    scores: defaultdict,
+    scored_rows: Counter,
 ) -> None:
     """
     Calculate true positives, false positives, false negatives, and true negatives
-    for the onderwerp signals.
-    """
-
-    # Select the appropriate signal list based on signal_type
-    if signal_type == "onderwerp":
-        signals = DATA[DATA["Hoofd_klantsignaal"].isin(ONDERWERP_SIGNALS)][
-            "Sub_klantsignaal"
-        ].tolist()
-    elif signal_type == "beleving":
-        signals = DATA[DATA["Hoofd_klantsignaal"].isin(BELEVING_SIGNALS)][
-            "Sub_klantsignaal"
-        ].tolist()
-    else:
+    for the given signal type. The counts are added in memory to `scores`, keyed
+    by (signal_type, label) as [tp, fp, fn]; true negatives are derived from
+    `scored_rows` when flushing, see `flush_scores`.
+    """
+
+    # Select the appropriate signal set based on signal_type
+    signals = SUB_SIGNAL_SETS.get(signal_type)
+    if signals is None:
         raise ValueError(f"Unknown signal type: {signal_type}")
 
-    # Calculate true positives, false positives, false negatives, and true negatives for each label
-    for label in signals:
-        tp, tn, fp, fn = 0, 0, 0, 0
-        if label in generated and label in actual:
-            tp += 1
-
-        elif label in generated and label not in actual:
-            fp += 1
-
-        elif label not in generated and label in actual:
-            fn += 1
-
-        elif label not in generated and label not in actual:
-            tn += 1
-
-        # Add the scores to the database
-        cursor.execute(
-            """
-            INSERT INTO scores (signal_type, label, tp, fp, fn, tn)
-            VALUES (?, ?, ?, ?, ?, ?)
-            ON CONFLICT(signal_type, label) DO UPDATE SET
-                tp = tp + excluded.tp,
-                fp = fp + excluded.fp,
-                fn = fn + excluded.fn,
-                tn = tn + excluded.tn
-            """,
-            (
-                signal_type,
-                label,
-                tp,
-                fp,
-                fn,
-                tn,
-            ),
-        )
+    # Only labels from the taxonomy are scored
+    generated_set = signals.intersection(generated)
+    actual_set = signals.intersection(actual)
+
+    for label in generated_set & actual_set:
+        scores[(signal_type, label)][0] += 1
+    for label in generated_set - actual_set:
+        scores[(signal_type, label)][1] += 1
+    for label in actual_set - generated_set:
+        scores[(signal_type, label)][2] += 1
+    # Every other label of this signal type is a true negative for this row;
+    # counting the row is enough, instead of touching every label
+    scored_rows[signal_type] += 1
+
+
+def flush_scores(scores: defaultdict, scored_rows: Counter, cursor: sqlite3.Cursor) -> None:
+    """
+    Adds the in-memory score counts to the scores table and resets them.
+    A label is a true negative in every scored row where it was neither
+    generated nor expected, so tn = rows - tp - fp - fn.
+    """
+    rows = []
+    for signal_type, labels in SUB_SIGNAL_LISTS.items():
+        row_count = scored_rows.get(signal_type)
+        if not row_count:
+            continue
+        for label in labels:
+            tp, fp, fn = scores.get((signal_type, label), (0, 0, 0))
+            rows.append((signal_type, label, tp, fp, fn, row_count - tp - fp - fn))
+    cursor.executemany(UPSERT_SCORES_SQL, rows)
+    scores.clear()
+    scored_rows.clear()
+
+
+def flush_texts(text_rows: list[tuple], cursor: sqlite3.Cursor) -> None:
+    """
+    Inserts the buffered texts and labels rows and resets the buffer.
+    """
+    cursor.executemany(INSERT_TEXT_SQL, text_rows)
+    text_rows.clear()
+
+
+def dump_label_list(labels: list) -> str:
+    """
+    Serializes a label list for the database. Every label column goes through
+    here, so non-ASCII labels are always stored as plain UTF-8.
+    """
+    return orjson.dumps(labels).decode()
+
+
+def parse_label_list(value) -> list:
+    """
+    Parses a JSON label list, returning an empty list for anything else.
+    Falls back to `ast.literal_eval` for rows stored as `str(list)`.
+    """
+    try:
+        labels = orjson.loads(value)
+    except orjson.JSONDecodeError:
+        try:
+            labels = ast.literal_eval(value)
+        except Exception:
+            return []
+    return labels if isinstance(labels, list) else []
 
 
 def validate_dataset_labels(dataset) -> dict[str, int]:
@@ -170,47 +243,29 @@ def validate_dataset_labels(dataset) -> dict[str, int]:
     Validates that all gold labels in the dataset exist in the taxonomy.
     Returns a dictionary of invalid labels and their occurrence counts.
     """
-    # Build set of all valid taxonomy labels for O(1) lookup
-    all_valid_labels = set()
-    
-    # Get onderwerp sub-signals
-    onderwerp_signals = DATA[DATA["Hoofd_klantsignaal"].isin(ONDERWERP_SIGNALS)][
-        "Sub_klantsignaal"
-    ].tolist()
-    all_valid_labels.update(onderwerp_signals)
-    
-    # Get beleving sub-signals  
-    beleving_signals = DATA[DATA["Hoofd_klantsignaal"].isin(BELEVING_SIGNALS)][
-        "Sub_klantsignaal"
-    ].tolist()
-    all_valid_labels.update(beleving_signals)
-    
-    # Also add special labels
-    all_valid_labels.add("No subtopic found")
-    
-    # Collect all unique labels from dataset with counts
-    invalid_label_counts = {}
-    total_rows = len(dataset)
-    
-    for row in dataset:
-        try:
-            gold_labels = ast.literal_eval(row["gold_labels"])
-            if not isinstance(gold_labels, list):
-                gold_labels = []
-        except:
-            gold_labels = []
-            
-        for label in gold_labels:
-            if label not in all_valid_labels:
-                invalid_label_counts[label] = invalid_label_counts.get(label, 0) + 1
-                
-    return invalid_label_counts
+    # All valid taxonomy labels, plus the special "No subtopic found" label
+    all_valid_labels = ONDERWERP_SUB_SET | BELEVING_SUB_SET | {"No subtopic found"}
+
+    # Explode the parsed label lists to one label per row and count the labels
+    # outside the taxonomy in a single vectorized pass
+    gold_labels = pd.Series(dataset["gold_labels_parsed"]).explode().dropna()
+    invalid_label_counts = gold_labels[~gold_labels.isin(all_valid_labels)].value_counts()
+
+    return invalid_label_counts.to_dict()
 
 
 def setup_local_db(local_db_path: str) -> tuple[sqlite3.Connection, sqlite3.Cursor]:
-    conn = sqlite3.connect(local_db_path)
+    # The hot statements are module-level constants, so each is prepared once
+    # and then reused from the statement cache
+    conn = sqlite3.connect(local_db_path, cached_statements=256)
     cursor = conn.cursor()
 
+    # Tune for many small upserts: WAL journal, fewer fsyncs, larger page cache
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-65536")  # 64 MiB
+
     # Create text_and_labels table if it doesn't exist
     cursor.execute(
         """
@@ -223,22 +278,32 @@ def setup_local_db(local_db_path: str) -> tuple[sqlite3.Connection, sqlite3.Curs
     """
     )
 
-    # Create scores table if it doesn't exist
+    # Create scores table if it doesn't exist. The (signal_type, label) key is
+    # the clustered primary key, so upserts hit a single B-tree lookup.
     cursor.execute(
         """
         CREATE TABLE IF NOT EXISTS scores (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
             signal_type TEXT,
             label TEXT,
             tp INTEGER,
             fp INTEGER,
             fn INTEGER,
             tn INTEGER,
-            UNIQUE(signal_type, label)
-        )
+            PRIMARY KEY (signal_type, label)
+        ) WITHOUT ROWID
     """
     )
 
+    # Seed a zero row per taxonomy label so every label shows up in the report
+    cursor.executemany(
+        "INSERT OR IGNORE INTO scores (signal_type, label, tp, fp, fn, tn) VALUES (?, ?, 0, 0, 0, 0)",
+        [
+            (signal_type, label)
+            for signal_type, labels in SUB_SIGNAL_LISTS.items()
+            for label in labels
+        ],
+    )
+
     conn.commit()
     return conn, cursor
 
@@ -248,7 +313,8 @@ def load_data_source(args, cursor):
     Load data from either Excel file or HuggingFace dataset based on arguments.
     
     Returns:
-        Dataset: HuggingFace dataset with 'text' and 'gold_labels' columns
+        Dataset: HuggingFace dataset with 'text', 'gold_labels' and
+            'gold_labels_parsed' (list of labels, never empty) columns
     """
     if args.excel_file:
         # Load from Excel file
@@ -278,11 +344,15 @@ def load_data_source(args, cursor):
                 args.labels_column: 'gold_labels'
             })
             
-            # Convert labels to string format if needed (Excel might have lists as strings)
+            # Convert labels to string format if needed (Excel might have lists as strings).
+            # The cells are split in one vectorized pass; empty cells become '[]'
             if 'gold_labels' in df.columns:
-                df['gold_labels'] = df['gold_labels'].apply(
-                    lambda x: str(x.split('; ')) if isinstance(x, str) and '; ' in x else str([x]) if pd.notna(x) else '[]'
-                )
+                has_labels = df['gold_labels'].notna()
+                split_labels = df['gold_labels'].where(has_labels, '').astype(str).str.split('; ')
+                df['gold_labels'] = [
+                    dump_label_list(labels) if present else '[]'
+                    for labels, present in zip(split_labels.to_numpy(), has_labels.to_numpy())
+                ]
             
             # Convert to HuggingFace Dataset
             dataset = Dataset.from_pandas(df[['text', 'gold_labels']])
@@ -323,70 +393,136 @@ def load_data_source(args, cursor):
             'Synthetic Text': 'text',
             'validated_labels': 'gold_labels'
         })
+
+    # Parse the gold labels once, in batches, into a list column. Rows without
+    # labels get "No subtopic found"; large datasets are parsed in parallel.
+    dataset = dataset.map(
+        lambda batch: {
+            "gold_labels_parsed": [
+                parse_label_list(x) or ["No subtopic found"] for x in batch["gold_labels"]
+            ]
+        },
+        batched=True,
+        batch_size=1000,
+        num_proc=os.cpu_count() if len(dataset) >= PARALLEL_PARSE_MIN_ROWS else None,
+    )
     
     return dataset
 
 
+def iter_batches(dataset: Dataset, batch_size: int):
+    """
+    Yields the dataset as lists of row dicts, reading the underlying Arrow
+    table in batches instead of decoding one row at a time.
+    """
+    for batch in dataset.iter(batch_size=batch_size):
+        columns = list(batch)
+        yield [dict(zip(columns, values)) for values in zip(*batch.values())]
+
+
+def run_pipeline(pipeline, dataset: Dataset, max_workers: int):
+    """
+    Yields (row, state) pairs in dataset order while keeping up to
+    `max_workers` pipeline runs in flight, so one slow row does not stall a
+    whole batch. Pipeline failures are raised when their row is reached.
+    """
+    executor = ThreadPoolExecutor(max_workers=max_workers)
+    pending = deque()
+    try:
+        for batch in iter_batches(dataset, COMMIT_BATCH_SIZE):
+            for row in batch:
+                pending.append(
+                    (row, executor.submit(pipeline.invoke, TextToKGState(text=row["text"])))
+                )
+                if len(pending) >= 2 * max_workers:
+                    row, future = pending.popleft()
+                    yield row, future.result()
+        while pending:
+            row, future = pending.popleft()
+            yield row, future.result()
+    finally:
+        # Don't start queued rows when the run stops early
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+def safe_divide(numerator: np.ndarray, denominator: np.ndarray) -> np.ndarray:
+    """
+    Element-wise division that yields 0 where the denominator is 0. Only the
+    valid entries are divided, writing straight into the result array.
+    """
+    return np.divide(
+        numerator,
+        denominator,
+        out=np.zeros(len(numerator), dtype=np.float64),
+        where=denominator > 0,
+    )
+
+
+def sorted_score_sheets(df_scores: pd.DataFrame):
+    """
+    Yields (signal_type, scores indexed by label) per sheet: onderwerp first,
+    labels in taxonomy order. Labels no longer in the taxonomy (from an older
+    database) follow alphabetically, so the layout never depends on how
+    SQLite happens to store the rows.
+    """
+    groups = {
+        signal_type: df.drop(columns="signal_type").set_index("label")
+        for signal_type, df in df_scores.groupby("signal_type", sort=True)
+    }
+    for signal_type in [*SUB_SIGNAL_LISTS, *sorted(groups.keys() - SUB_SIGNAL_LISTS.keys())]:
+        df = groups.get(signal_type)
+        if df is None:
+            continue
+        position = {label: i for i, label in enumerate(SUB_SIGNAL_LISTS.get(signal_type, ()))}
+        order = np.argsort(
+            [position.get(label, len(position)) for label in df.index], kind="stable"
+        )
+        yield signal_type, df.iloc[order]
+
+
 def write_to_excel(cursor: sqlite3.Cursor, excel_path: str) -> None:
     """
     Write the texts and labels and scores to an Excel file.
     """
-    # Get the texts and labels from the database
-    cursor.execute("SELECT * FROM texts_and_labels")
+    # Get the texts and labels from the database, ordered by the INTEGER
+    # PRIMARY KEY so SQLite reads them straight off the table B-tree
+    cursor.execute(
+        "SELECT id, text, gold_labels, generated_labels FROM texts_and_labels ORDER BY id"
+    )
     texts_and_labels = cursor.fetchall()
     df_texts = pd.DataFrame(
         texts_and_labels,
         columns=["id", "text", "gold_labels", "generated_labels"],
     )
-    df_texts["gold_labels"] = df_texts["gold_labels"].apply(
-        lambda x: ast.literal_eval(x) if isinstance(x, str) else x
+    # Parse the label columns over the raw object arrays, skipping pandas' per-row dispatch
+    for column in ("gold_labels", "generated_labels"):
+        df_texts[column] = [
+            parse_label_list(x) if isinstance(x, str) else x
+            for x in df_texts[column].to_numpy()
+        ]
+
+    # Get the scores from the database and compute the metrics for all
+    # signal types at once
+    df_scores = pd.read_sql_query(
+        "SELECT signal_type, label, tp, fp, fn, tn FROM scores ORDER BY signal_type, label",
+        cursor.connection,
     )
-    df_texts["generated_labels"] = df_texts["generated_labels"].apply(
-        lambda x: ast.literal_eval(x) if isinstance(x, str) else x
-    )
-    df_texts["id"] = df_texts["id"].astype(int)
-    df_texts = df_texts.sort_values(by="id").reset_index(drop=True)
-
-    # Get the scores from the database
-    cursor.execute("SELECT * FROM scores")
-    scores = cursor.fetchall()
-    existing_scores = {}
-    for row in scores:
-        signal_type = row[1]
-        label = row[2]
-        tp = row[3]
-        fp = row[4]
-        fn = row[5]
-        tn = row[6]
-        if signal_type not in existing_scores:
-            existing_scores[signal_type] = {}
-        existing_scores[signal_type][label] = {
-            "tp": tp,
-            "fp": fp,
-            "fn": fn,
-            "tn": tn,
-        }
+    tp = df_scores["tp"].to_numpy(dtype=np.float64)
+    precision = safe_divide(tp, tp + df_scores["fp"].to_numpy())
+    recall = safe_divide(tp, tp + df_scores["fn"].to_numpy())
+    df_scores["precision"] = precision
+    df_scores["recall"] = recall
+    df_scores["f1_score"] = safe_divide(2 * precision * recall, precision + recall)
 
     # Write the texts and labels and scores to an Excel file
     try:
-        with pd.ExcelWriter(excel_path) as writer:
+        # xlsxwriter writes faster and with less memory than openpyxl. Its
+        # constant_memory mode can't be used: pandas writes cells column by
+        # column, and that mode drops cells written above the current row.
+        with pd.ExcelWriter(excel_path, engine="xlsxwriter") as writer:
             df_texts.to_excel(writer, sheet_name="texts_and_labels", index=False)
 
-            for signal_type, scores in existing_scores.items():
-                df = pd.DataFrame(scores).T
-
-                df["precision"] = np.where(
-                    (df["tp"] + df["fp"]) > 0, df["tp"] / (df["tp"] + df["fp"]), 0
-                )
-                df["recall"] = np.where(
-                    (df["tp"] + df["fn"]) > 0, df["tp"] / (df["tp"] + df["fn"]), 0
-                )
-                df["f1_score"] = np.where(
-                    (df["precision"] + df["recall"]) > 0,
-                    (2 * df["precision"] * df["recall"])
-                    / (df["precision"] + df["recall"]),
-                    0,
-                )
+            for signal_type, df in sorted_score_sheets(df_scores):
                 df.to_excel(writer, sheet_name=f"{signal_type}_scores")
 
         print(f"{Colors.GREEN}Metrics written to {excel_path}{Colors.ENDC}")
@@ -442,68 +578,92 @@ def main(args) -> None:
         llm=azure_llm(model_prefix="GPT41", temperature=0.0), add_labels=True
     ).compile()
 
-    for idx, row in enumerate(dataset):
-        # Print separator and row indicator
-        print(f"\n{Colors.BLUE}{'━' * 80}{Colors.ENDC}")
-        print(f"{Colors.HEADER}{Colors.BOLD}Processing row {idx + 1} of {len(dataset)}{Colors.ENDC}")
-        
-        # Get the actual labels from the dataset
-        gold_labels = ast.literal_eval(row["gold_labels"])
-        if not gold_labels:
-            gold_labels = ["No subtopic found"]
-
-        # Initialize the pipeline with the state and run it
-        state = TextToKGState(
-            text=row["text"],
-        )
-        state = pipeline.invoke(state)
+    # Text rows and score counts are accumulated in memory and written once per batch
+    text_rows = []
+    scores = defaultdict(lambda: [0, 0, 0])
+    scored_rows = Counter()
+    idx = 0
+    progress = tqdm(total=len(dataset), desc="Processing rows", unit="row", disable=args.verbose)
+    try:
+        # The LLM calls are I/O bound, so rows run concurrently in a thread
+        # pool; the results come back in input order. Only the columns used
+        # below are read from the Arrow table.
+        rows = dataset.select_columns(["text", "gold_labels_parsed"])
+        for row, state in run_pipeline(pipeline, rows, args.concurrency):
+            # Commit the changes to the database once per batch of rows
+            if idx and idx % COMMIT_BATCH_SIZE == 0:
+                flush_texts(text_rows, cursor)
+                flush_scores(scores, scored_rows, cursor)
+                conn.commit()
 
-        # Get tp, tn, fp, fn for each signal type
-        try:
-            # Get the generated sub_signal labels from the state
-            beleving_generated, onderwerp_generated = get_labels_from_json_ld(state)
+            idx += 1
+            progress.update()
+
+            # Print separator and row indicator
+            if args.verbose:
+                print(f"\n{Colors.BLUE}{'━' * 80}{Colors.ENDC}")
+                print(f"{Colors.HEADER}{Colors.BOLD}Processing row {idx} of {len(dataset)}{Colors.ENDC}")
 
-            # Get the actual sub_signal labels from the dataset
-            beleving_actual, onderwerp_actual = get_labels_from_validated_list(
-                gold_labels
-            )
+            # Get the actual labels from the dataset
+            gold_labels = row["gold_labels_parsed"]
 
+            # Get tp, tn, fp, fn for each signal type
             try:
-                # Add the text and labels to the database
-                cursor.execute(
-                    "INSERT INTO texts_and_labels (text, gold_labels, generated_labels) VALUES (?, ?, ?)",
-                    (
-                        row["text"],
-                        str(gold_labels),
-                        str(beleving_generated + onderwerp_generated),
-                    ),
-                )
+                # Get the generated sub_signal labels from the state
+                beleving_generated, onderwerp_generated = get_labels_from_json_ld(state)
 
-                calculate_metrics_signals(
-                    "onderwerp", onderwerp_generated, onderwerp_actual, cursor
-                )
-                calculate_metrics_signals(
-                    "beleving", beleving_generated, beleving_actual, cursor
+                # Get the actual sub_signal labels from the dataset
+                beleving_actual, onderwerp_actual = get_labels_from_validated_list(
+                    gold_labels
                 )
 
-                # Commit the changes to the database
-                conn.commit()
-            except Exception as e:
-                print(f"{Colors.RED}Error calculating metrics: {e}{Colors.ENDC}")
+                try:
+                    # Buffer the text and labels for the database
+                    text_rows.append(
+                        (
+                            row["text"],
+                            dump_label_list(gold_labels),
+                            dump_label_list(beleving_generated + onderwerp_generated),
+                        )
+                    )
+
+                    calculate_metrics_signals(
+                        "onderwerp", onderwerp_generated, onderwerp_actual, scores, scored_rows
+                    )
+                    calculate_metrics_signals(
+                        "beleving", beleving_generated, beleving_actual, scores, scored_rows
+                    )
+                except Exception as e:
+                    print(f"{Colors.RED}Error calculating metrics: {e}{Colors.ENDC}")
+                    continue
+            except ValueError as e:
+                print(f"{Colors.RED}ValueError processing labels: {e}{Colors.ENDC}")
+                continue
+            except KeyError as e:
+                print(f"{Colors.RED}KeyError processing labels: {e}{Colors.ENDC}")
                 continue
-        except ValueError as e:
-            print(f"{Colors.RED}ValueError processing labels: {e}{Colors.ENDC}")
-            continue
-        except KeyError as e:
-            print(f"{Colors.RED}KeyError processing labels: {e}{Colors.ENDC}")
-            continue
-        
-        # Add spacing after each row processing
-        print()
+
+            # Add spacing after each row processing
+            if args.verbose:
+                print()
+    finally:
+        # Commit the last (partial) batch, also when the run is interrupted
+        flush_texts(text_rows, cursor)
+        flush_scores(scores, scored_rows, cursor)
+        conn.commit()
+        progress.close()
+
+    # Report the skipped labels once instead of per row
+    if SKIPPED_LABELS:
+        print(f"\n{Colors.ORANGE}Info: Skipped labels not found in taxonomy file ({os.path.basename(TAXONOMY_FILE)}):{Colors.ENDC}")
+        for label, count in SKIPPED_LABELS.most_common():
+            print(f"  {Colors.ORANGE}{label}{Colors.ENDC}: {count} occurrences")
 
     # Write to Excel file
     write_to_excel(cursor, args.output_excel)
 
+    # Let SQLite refresh its query planner statistics before closing
+    cursor.execute("PRAGMA optimize")
     conn.close()
     print(f"\n{Colors.GREEN}{Colors.BOLD}Metrics saved to: {args.output_excel}{Colors.ENDC}")
 
@@ -558,6 +718,21 @@ Examples:
         help='Number of rows to process from HuggingFace dataset (default: %(default)s)'
     )
     
+    # Processing options
+    processing_group = parser.add_argument_group('processing options')
+    processing_group.add_argument(
+        '--concurrency',
+        type=positive_int,
+        default=8,
+        help='Number of rows run through the pipeline concurrently (default: %(default)s)'
+    )
+    
+    processing_group.add_argument(
+        '--verbose',
+        action='store_true',
+        help='Print a colored header per row instead of a progress bar'
+    )
+    
     # Output options
     output_group = parser.add_argument_group('output options')
     output_group.add_argument(
@@ -1,10 +1,13 @@
 #!/usr/bin/env python3
 """Test the usage example from README.md"""
 
-import asyncio
-import json
-from graph.text_to_kg_pipeline import TextToKGPipeline
-from graph.utils import azure_llm
+import argparse
+import orjson
+import os
+import re
+import sys
+import time
+from _shared import positive_int, run_async, warm_pipeline
 
 # ANSI color codes
 class Colors:
@@ -18,117 +21,177 @@ class Colors:
     BOLD = '\033[1m'
     UNDERLINE = '\033[4m'
 
-async def test_usage():
+class _NoColors:
+    HEADER = BLUE = CYAN = GREEN = YELLOW = RED = ENDC = BOLD = UNDERLINE = ''
+
+# Plain output when piped (e.g. into a CI log) or when NO_COLOR is set
+if not sys.stdout.isatty() or os.environ.get("NO_COLOR"):
+    Colors = _NoColors
+
+# Report line templates, with the color codes filled in once
+_ENTITY_FMT = f"    • {Colors.CYAN}%s{Colors.ENDC} ({Colors.GREEN}%s{Colors.ENDC}): %s"
+_RELATION_FMT = f"    • {Colors.CYAN}%s{Colors.ENDC} → {Colors.YELLOW}%s{Colors.ENDC} → {Colors.CYAN}%s{Colors.ENDC}"
+_SCHEMA_FMT = f"  • {Colors.CYAN}%s{Colors.ENDC} → {Colors.GREEN}%s{Colors.ENDC}"
+_LABEL_FMT = f"  • {Colors.GREEN}%s{Colors.ENDC}"
+
+# Matches the key of every "key": value line in indented JSON
+_KEY_RE = re.compile(r'^(?P<ws>[ \t]*)(?P<key>"(?:[^"\\]|\\.)*")(?P<post>\s*:)', re.MULTILINE)
+
+def _colorize(formatted_json: str) -> str:
+    """Colors the keys of indented JSON in one pass over the whole string."""
+    if Colors is _NoColors:
+        return formatted_json
+    return _KEY_RE.sub(
+        lambda m: f'{m["ws"]}{Colors.CYAN}{m["key"]}{Colors.ENDC}{m["post"]}', formatted_json
+    )
+
+def _render_extraction(extraction: dict, result: dict, add) -> None:
+    """Renders the entity extraction results."""
+    add(f"{Colors.HEADER}{Colors.BOLD}Entity Extraction Results:{Colors.ENDC}")
+    
+    # Print summary
+    summary = extraction.get("summary")
+    if summary is not None:
+        add(f"  {Colors.YELLOW}Summary:{Colors.ENDC} {summary}")
+        add("")
+    
+    # Print entities
+    entities = extraction.get("entities")
+    if entities:
+        add(f"  {Colors.YELLOW}Entities:{Colors.ENDC}")
+        for entity_triple in entities:
+            match entity_triple:
+                case (entity_name, class_name, description, *_):
+                    add(_ENTITY_FMT % (entity_name, class_name, description))
+    
+    # Print relations
+    relations = extraction.get("relations")
+    if relations:
+        add(f"\n  {Colors.YELLOW}Relations:{Colors.ENDC}")
+        for relation in relations:
+            match relation:
+                case (subject, predicate, obj, *_):
+                    add(_RELATION_FMT % (subject, predicate, obj))
+    add("")
+
+def _render_schema(schema_defs: dict, result: dict, add) -> None:
+    """Renders the class name to Schema.org type mappings."""
+    if not schema_defs:
+        return
+    add(f"{Colors.HEADER}{Colors.BOLD}Schema Mappings:{Colors.ENDC}")
+    
+    # schema_definitions is a Dict[str, str] where key is class name and value is YAML definition
+    if isinstance(schema_defs, dict):
+        for class_name, yaml_def in schema_defs.items():
+            # Extract Schema.org type from YAML definition
+            # The YAML starts with the schema type followed by a colon
+            if yaml_def and isinstance(yaml_def, str):
+                # Only the first line is needed, so don't split the whole definition
+                first_line, _, _ = yaml_def.lstrip().partition('\n')
+                schema_type = first_line.rstrip().rstrip(':')
+                add(_SCHEMA_FMT % (class_name, schema_type))
+    add("")
+
+def _render_validation(validation_runs: int, result: dict, add) -> None:
+    """Renders the validation status and attempts."""
+    validation_status = "PASSED" if result.get("validation_returncode") == 0 else "FAILED"
+    color = Colors.GREEN if validation_status == "PASSED" else Colors.RED
+    add(f"{Colors.HEADER}{Colors.BOLD}Validation Results:{Colors.ENDC}")
+    add(f"  Status: {color}{validation_status}{Colors.ENDC}")
+    add(f"  Attempts: {validation_runs}/{result['validation_max_runs']}")
+    validation_output = result.get("validation_output")
+    if validation_output:
+        add(f"  {Colors.YELLOW}Last error:{Colors.ENDC} {validation_output[:100]}...")
+    add("")
+
+def _render_json_ld(json_ld_contents: list, result: dict, add) -> None:
+    """Renders the last generated JSON-LD document, with highlighted keys."""
+    if not json_ld_contents:
+        return
+    add(f"{Colors.HEADER}{Colors.BOLD}Generated JSON-LD:{Colors.ENDC}")
+    json_ld = orjson.loads(json_ld_contents[-1])
+    formatted_json = orjson.dumps(json_ld, option=orjson.OPT_INDENT_2).decode()
+    # Add syntax highlighting to JSON
+    add(_colorize(formatted_json))
+    add("")
+
+def _render_labels(labels: list, result: dict, add) -> None:
+    """Renders the generated labels, if any."""
+    if not labels:
+        return
+    add(f"{Colors.HEADER}{Colors.BOLD}Generated Labels:{Colors.ENDC}")
+    for label in labels:
+        add(_LABEL_FMT % (label,))
+    add("")
+
+# Report sections in output order: (result key, renderer)
+RENDERERS = [
+    ("entity_extraction_output", _render_extraction),
+    ("schema_definitions", _render_schema),
+    ("validation_runs", _render_validation),
+    ("json_ld_contents", _render_json_ld),
+    ("labels", _render_labels),
+]
+
+async def test_usage(batch: int = 1, concurrency: int = 10):
     # Input text
     input_text = "Mark Rutte (Den Haag, 14 februari 1967) was van 14 oktober 2010 tot 2 juli 2024 minister-president van Nederland"
     
     print(f"{Colors.HEADER}{Colors.BOLD}=== Text-to-Knowledge-Graph Pipeline Test ==={Colors.ENDC}\n")
     print(f"{Colors.CYAN}Input text:{Colors.ENDC} \"{input_text}\"\n")
     
-    # Initialize pipeline with Azure LLM
+    # Initialize pipeline with Azure LLM, warming up the connection to Azure
+    # while the pipeline is built
     print(f"{Colors.YELLOW}Initializing pipeline...{Colors.ENDC}")
-    pipeline = TextToKGPipeline(
-        llm=azure_llm(model_prefix="GPT4O"),  # Using default GPT4O model
-        add_labels=True
-    ).compile()
-    print(f"{Colors.GREEN}✓ Pipeline initialized{Colors.ENDC}\n")
-    
-    # Process text
-    print(f"{Colors.YELLOW}Processing text through pipeline...{Colors.ENDC}")
-    result = await pipeline.ainvoke(
-        {"text": input_text},
-        config={"configurable": {"max_retries": 3}}
-    )
-    print(f"{Colors.GREEN}✓ Pipeline execution completed!{Colors.ENDC}\n")
-    
-    # Print entity extraction results
-    if "entity_extraction_output" in result:
-        print(f"{Colors.HEADER}{Colors.BOLD}Entity Extraction Results:{Colors.ENDC}")
-        extraction = result["entity_extraction_output"]
-        
-        # Print summary
-        if "summary" in extraction:
-            print(f"  {Colors.YELLOW}Summary:{Colors.ENDC} {extraction['summary']}")
-            print()
-        
-        # Print entities
-        if "entities" in extraction and extraction["entities"]:
-            print(f"  {Colors.YELLOW}Entities:{Colors.ENDC}")
-            for entity_triple in extraction["entities"]:
-                if len(entity_triple) >= 3:
-                    entity_name, class_name, description = entity_triple
-                    print(f"    • {Colors.CYAN}{entity_name}{Colors.ENDC} ({Colors.GREEN}{class_name}{Colors.ENDC}): {description}")
-        
-        # Print relations
-        if "relations" in extraction and extraction["relations"]:
-            print(f"\n  {Colors.YELLOW}Relations:{Colors.ENDC}")
-            for relation in extraction["relations"]:
-                if len(relation) >= 3:
-                    subject, predicate, obj = relation
-                    print(f"    • {Colors.CYAN}{subject}{Colors.ENDC} → {Colors.YELLOW}{predicate}{Colors.ENDC} → {Colors.CYAN}{obj}{Colors.ENDC}")
-        print()
-    
-    # Print schema mappings
-    if "schema_definitions" in result and result["schema_definitions"]:
-        print(f"{Colors.HEADER}{Colors.BOLD}Schema Mappings:{Colors.ENDC}")
-        schema_defs = result["schema_definitions"]
+    async with warm_pipeline(model_prefix="GPT4O", add_labels=True) as pipeline:  # Using default GPT4O model
+        print(f"{Colors.GREEN}✓ Pipeline initialized{Colors.ENDC}\n")
         
-        # schema_definitions is a Dict[str, str] where key is class name and value is YAML definition
-        if isinstance(schema_defs, dict):
-            for class_name, yaml_def in schema_defs.items():
-                # Extract Schema.org type from YAML definition
-                # The YAML starts with the schema type followed by a colon
-                if yaml_def and isinstance(yaml_def, str):
-                    lines = yaml_def.strip().split('\n')
-                    if lines:
-                        schema_type = lines[0].rstrip(':')
-                        print(f"  • {Colors.CYAN}{class_name}{Colors.ENDC} → {Colors.GREEN}{schema_type}{Colors.ENDC}")
-        print()
-    
-    # Print validation results
-    if "validation_runs" in result:
-        validation_status = "PASSED" if result.get("validation_returncode") == 0 else "FAILED"
-        color = Colors.GREEN if validation_status == "PASSED" else Colors.RED
-        print(f"{Colors.HEADER}{Colors.BOLD}Validation Results:{Colors.ENDC}")
-        print(f"  Status: {color}{validation_status}{Colors.ENDC}")
-        print(f"  Attempts: {result['validation_runs']}/{result['validation_max_runs']}")
-        if result.get("validation_output"):
-            print(f"  {Colors.YELLOW}Last error:{Colors.ENDC} {result['validation_output'][:100]}...")
-        print()
-    
-    # Print JSON-LD output
-    if "json_ld_contents" in result and result["json_ld_contents"]:
-        print(f"{Colors.HEADER}{Colors.BOLD}Generated JSON-LD:{Colors.ENDC}")
-        json_ld = json.loads(result["json_ld_contents"][-1])
-        formatted_json = json.dumps(json_ld, indent=2, ensure_ascii=False)
-        # Add syntax highlighting to JSON
-        formatted_json = formatted_json.replace('"@context":', f'{Colors.YELLOW}"@context":{Colors.ENDC}')
-        formatted_json = formatted_json.replace('"@type":', f'{Colors.YELLOW}"@type":{Colors.ENDC}')
-        for line in formatted_json.split('\n'):
-            if ':' in line and not line.strip().startswith('{'):
-                parts = line.split(':', 1)
-                key_part = parts[0]
-                value_part = parts[1] if len(parts) > 1 else ''
-                # Color the keys
-                if '"' in key_part:
-                    key_start = key_part.find('"')
-                    key_end = key_part.rfind('"')
-                    colored_key = key_part[:key_start] + f'{Colors.CYAN}{key_part[key_start:key_end+1]}{Colors.ENDC}' + key_part[key_end+1:]
-                    line = colored_key + ':' + value_part
-            print(line)
-        print()
+        # Process text, `batch` times concurrently; the first result is reported below
+        print(f"{Colors.YELLOW}Processing text through pipeline ({batch} run(s))...{Colors.ENDC}")
+        start = time.perf_counter()
+        results = await pipeline.abatch(
+            [{"text": input_text}] * batch,
+            config={"max_concurrency": concurrency, "configurable": {"max_retries": 3}}
+        )
+        elapsed = time.perf_counter() - start
+    result = results[0]
+    print(f"{Colors.GREEN}✓ Pipeline execution completed!{Colors.ENDC}\n")
     
-    # Print labels if any
-    if "labels" in result and result["labels"]:
-        print(f"{Colors.HEADER}{Colors.BOLD}Generated Labels:{Colors.ENDC}")
-        for label in result["labels"]:
-            print(f"  • {Colors.GREEN}{label}{Colors.ENDC}")
-        print()
+    # Collect the report lines and write them in one go
+    out = []
+    add = out.append
+
+    # Render every section present in the result
+    for key, render in RENDERERS:
+        value = result.get(key)
+        if value is not None:
+            render(value, result, add)
     
     # Summary
-    print(f"{Colors.HEADER}{Colors.BOLD}Summary:{Colors.ENDC}")
-    print(f"  • Result keys: {Colors.CYAN}{', '.join(result.keys())}{Colors.ENDC}")
-    print(f"  • Total processing nodes: {Colors.GREEN}5{Colors.ENDC} (Entity Extraction → Schema Mapping → KG Generation → Validation → Labeling)")
+    add(f"{Colors.HEADER}{Colors.BOLD}Summary:{Colors.ENDC}")
+    add(f"  • Result keys: {Colors.CYAN}{', '.join(result.keys())}{Colors.ENDC}")
+    add(f"  • Total processing nodes: {Colors.GREEN}5{Colors.ENDC} (Entity Extraction → Schema Mapping → KG Generation → Validation → Labeling)")
+    add(f"  • Runs: {Colors.GREEN}{batch}{Colors.ENDC} in {elapsed:.1f}s ({elapsed / batch:.1f}s per run, max {concurrency} concurrent)")
+    add("")
+    sys.stdout.write("\n".join(out))
     
+def create_argument_parser():
+    """Create and return the argument parser."""
+    parser = argparse.ArgumentParser(description="Test the usage example from README.md")
+    parser.add_argument(
+        '--batch',
+        type=positive_int,
+        default=1,
+        help='Number of times the example text is run through the pipeline (default: %(default)s)'
+    )
+    parser.add_argument(
+        '--concurrency',
+        type=positive_int,
+        default=10,
+        help='Maximum number of concurrent pipeline runs (default: %(default)s)'
+    )
+    return parser
+
 if __name__ == "__main__":
-    asyncio.run(test_usage())
\ No newline at end of file
+    args = create_argument_parser().parse_args()
+    run_async(test_usage(batch=args.batch, concurrency=args.concurrency))
\ No newline at end of file